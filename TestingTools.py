@@ -7,12 +7,142 @@ downloaden van testpersonen via de API van randomuser.me en het loggen van
 activiteiten.
 """
 
+import atexit
+import csv
 import logging
+import logging.handlers
+import queue
 import random
 import pathlib as pl
 import names as nm
+import numpy as np
 
 import requests as rq
+from urllib3.util.retry import Retry
+
+# Eén keer per proces opgelost; .resolve() doet een stat-keten die niet per
+# geconstrueerd object herhaald hoeft te worden.
+_SCRIPT_DIR = pl.Path(__file__).resolve().parent
+_OUTPUT_DIR = _SCRIPT_DIR / "output"
+_LOGGING_DIR = _SCRIPT_DIR / "logging"
+
+_DIRS_CREATED = False
+
+# Gewichten van de 11-proef; int32 zodat de matrixproduct-som niet overloopt.
+_BSN_GEWICHTEN = np.array([9, 8, 7, 6, 5, 4, 3, 2, -1], dtype=np.int32)
+
+# Machten van tien om een cijferrij in één keer naar een getal te vouwen.
+_TIENMACHTEN = np.array([10 ** i for i in range(8, -1, -1)], dtype=np.int64)
+
+# Letters waaruit postcodes worden samengesteld.
+_ALFABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Vooraf geformatteerde dag- en maandnummers met voorloopnul, zodat datums
+# zonder __format__-aanroepen per rij kunnen worden samengesteld.
+_DAGEN = [f"{i:02d}" for i in range(32)]
+_MAANDEN = [f"{i:02d}" for i in range(13)]
+
+_LOG_CONFIGURED = False
+
+logger = logging.getLogger(__name__)
+
+# Per proces ingelezen naamtabellen van de names-bibliotheek, gesleuteld op
+# bestandspad. De namen en cumulatieve gewichten staan als twee parallelle
+# NumPy-arrays (SoA) zodat zowel losse als gevectoriseerde trekkingen met
+# np.searchsorted over een aaneengesloten float64-array lopen.
+_NAMEN_CACHE: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _laad_naamtabel(bestand):
+    """
+    Parseer een databestand van `names` eenmalig naar parallelle arrays.
+
+    Parameters
+    ----------
+    bestand : str
+        Pad naar een databestand uit ``names.FILES``.
+
+    Returns
+    -------
+    tuple
+        Twee parallelle NumPy-arrays: (namen, cumulatieve gewichten).
+    """
+    if bestand not in _NAMEN_CACHE:
+        namen, cumulatief = [], []
+        with open(bestand, encoding="utf-8") as f:
+            for regel in f:
+                naam, _, cum, _ = regel.split()
+                namen.append(naam.capitalize())
+                cumulatief.append(float(cum))
+        _NAMEN_CACHE[bestand] = (
+            np.array(namen, dtype=object),
+            np.array(cumulatief, dtype=np.float64),
+        )
+    return _NAMEN_CACHE[bestand]
+
+
+def _kies_naam(bestand, rng):
+    """
+    Trek een gewogen willekeurige naam uit een databestand van `names`.
+
+    Het bestand wordt bij de eerste aanroep één keer geparseerd en daarna uit
+    de modulecache bediend, in plaats van per trekking opnieuw geopend en
+    regel voor regel doorlopen.
+
+    Parameters
+    ----------
+    bestand : str
+        Pad naar een databestand uit ``names.FILES``.
+    rng : random.Random
+        De PRNG-instantie waaruit de trekking komt, zodat de aanroeper niet
+        op het lock van de module-globale random-instantie hoeft te wachten.
+
+    Returns
+    -------
+    str
+        Een naam met hoofdletter, gewogen naar de frequenties in het bestand.
+    """
+    namen, cumulatief = _laad_naamtabel(bestand)
+    keuze = rng.random() * 90
+    index = np.searchsorted(cumulatief, keuze, side="right")
+    return namen[index] if index < len(namen) else ""
+
+
+def _configure_logging(log_file):
+    """
+    Configureer logging eenmalig per proces.
+
+    Herhaalde constructie van `TestingTools` opent zo niet telkens opnieuw een
+    FileHandler en voegt geen dubbele handlers aan de rootlogger toe.
+
+    De rootlogger krijgt alleen een QueueHandler; een QueueListener op een
+    achtergrondthread schrijft de records naar console en logbestand. Zo
+    blokkeren de genereer-methoden niet op schijf-I/O per logregel.
+
+    Parameters
+    ----------
+    log_file : pathlib.Path
+        Pad naar het logbestand.
+    """
+    global _LOG_CONFIGURED
+    if _LOG_CONFIGURED:
+        return
+    root = logging.getLogger()
+    if not root.handlers:
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        wachtrij = queue.Queue(-1)
+        root.setLevel(logging.INFO)
+        root.addHandler(logging.handlers.QueueHandler(wachtrij))
+        listener = logging.handlers.QueueListener(
+            wachtrij, file_handler, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+    _LOG_CONFIGURED = True
 
 
 class TestingTools:
@@ -33,6 +163,8 @@ class TestingTools:
         Directory waarin logbestanden worden opgeslagen.
     log_file : pathlib.Path
         Pad naar het logbestand (``app.log``).
+    session : requests.Session
+        Herbruikbare HTTP-sessie met connectiepool voor downloads.
     """
 
     def __init__(self):
@@ -44,23 +176,38 @@ class TestingTools:
         * het aanmaken van de mappen als deze nog niet bestaan,
         * het configureren van logging met zowel console- als bestandshandler.
         """
-        self.script_dir = pl.Path(__file__).resolve().parent
-        self.output_dir = self.script_dir / "output"
-        self.logging_dir = self.script_dir / "logging"
+        global _DIRS_CREATED
+
+        self.script_dir = _SCRIPT_DIR
+        self.output_dir = _OUTPUT_DIR
+        self.logging_dir = _LOGGING_DIR
 
-        self.output_dir.mkdir(exist_ok=True)
-        self.logging_dir.mkdir(exist_ok=True)
+        if not _DIRS_CREATED:
+            self.output_dir.mkdir(exist_ok=True)
+            self.logging_dir.mkdir(exist_ok=True)
+            _DIRS_CREATED = True
 
         self.log_file = self.logging_dir / "app.log"
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] %(message)s",
-            handlers=[
-                logging.FileHandler(self.log_file, encoding="utf-8"),
-                logging.StreamHandler()
-            ]
-        )
+        _configure_logging(self.log_file)
+
+        self.session = rq.Session()
+        # Transiente fouten (waaronder rate limiting) worden stil opnieuw
+        # geprobeerd over dezelfde warme verbinding.
+        retry = Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount("https://", rq.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retry))
+        self.session.headers.update({"Accept-Encoding": "gzip"})
+
+        self._personen_cache: dict[int, bytes] = {}
+        # Eigen PRNG-instantie zodat genereer-methoden niet op het lock van
+        # de module-globale random-instantie hoeven te wachten bij gebruik
+        # vanuit meerdere threads.
+        self._rng = random.Random()
+        # PCG64-generator voor de gevectoriseerde paden; sneller dan de
+        # verouderde globale RandomState en zonder gedeelde toestand.
+        self._np_rng = np.random.default_rng()
 
     def testbestand_personen(self, aantal: int):
         """
@@ -68,7 +215,8 @@ class TestingTools:
 
         Er wordt gebruikgemaakt van de API ``https://randomuser.me`` om testdata
         op te halen. Het resultaat wordt opgeslagen in de outputdirectory als
-        ``testpersonen.csv``.
+        ``testpersonen.csv``. Herhaalde aanroepen met hetzelfde aantal worden
+        uit een in-memory cache bediend zonder nieuwe download.
 
         Parameters
         ----------
@@ -81,14 +229,23 @@ class TestingTools:
             Indien er een fout optreedt tijdens het ophalen van de gegevens.
         """
         testpersonen = self.output_dir / "testpersonen.csv"
+        if aantal in self._personen_cache:
+            testpersonen.write_bytes(self._personen_cache[aantal])
+            logging.info("Testpersonen voor aantal %i uit cache opgeslagen in %s",
+                         aantal, testpersonen)
+            return
         url = f"https://randomuser.me/api/?results={aantal}&format=csv&nat=NL"
         logging.info("Downloading testpersonen van %s", url)
         try:
-            response = rq.get(url, timeout=10)
+            response = self.session.get(url, timeout=10, stream=True)
             if response.status_code == 200:
+                blokken = []
                 with open(testpersonen, "wb") as file:
-                    file.write(response.content)
-                    logging.info("Testpersonen opgeslagen in %s", testpersonen)
+                    for chunk in response.iter_content(65536):
+                        file.write(chunk)
+                        blokken.append(chunk)
+                self._personen_cache[aantal] = b"".join(blokken)
+                logging.info("Testpersonen opgeslagen in %s", testpersonen)
         except rq.exceptions.RequestException as e:
             logging.error("Fout bij het downloaden van testpersonen: %s", e)
     
@@ -106,12 +263,38 @@ class TestingTools:
         str
         Een willekeurig gegenereerde postcode als string.
         """
-        cijfers = random.randint(1000, 9999)
-        letters = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))
+        cijfers = self._rng.randint(1000, 9999)
+        letters = ''.join(self._rng.choices(_ALFABET, k=2))
         postcode = f"{cijfers} {letters}"
-        logging.info("Postcode %s is aangemaakt", postcode)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Postcode %s is aangemaakt", postcode)
         return postcode
-    
+
+    def genereer_postcode_batch(self, n: int):
+        """
+        Genereer `n` willekeurige Nederlandse postcodes in één batch.
+
+
+        De letters voor alle postcodes worden met één `choices`-aanroep
+        getrokken en daarna per postcode uitgesneden, zodat de per-aanroep
+        overhead over de batch wordt uitgesmeerd.
+
+
+        Parameters
+        ----------
+        n : int
+        Het aantal postcodes dat moet worden gegenereerd.
+
+
+        Returns
+        -------
+        list
+        Een lijst met `n` postcodes als strings.
+        """
+        letters = self._rng.choices(_ALFABET, k=2 * n)
+        return [f"{self._rng.randint(1000, 9999)} {letters[2 * i]}{letters[2 * i + 1]}"
+                for i in range(n)]
+
     def genereer_telefoonnummer(self):
         """
         Genereer een willekeurig Nederlands telefoonnummer.
@@ -126,8 +309,9 @@ class TestingTools:
         str
         Een willekeurig gegenereerd telefoonnummer als string.
         """
-        nummer = f"06{random.randint(10000000, 99999999)}"
-        logging.info("Telefoonnummer %s is aangemaakt", nummer)
+        nummer = f"06{self._rng.randint(10000000, 99999999)}"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Telefoonnummer %s is aangemaakt", nummer)
         return nummer
                 
     def genereer_email(self, voornaam: str, achternaam: str):
@@ -154,9 +338,10 @@ class TestingTools:
         Een willekeurig gegenereerd e-mailadres als string.
         """
         domeinen = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "example.com"]
-        domein = random.choice(domeinen)
+        domein = self._rng.choice(domeinen)
         email = f"{voornaam.lower()}.{achternaam.lower()}@{domein}"
-        logging.info("Email %s is aangemaakt", email)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Email %s is aangemaakt", email)
         return email
 
     def genereer_naam(self):
@@ -164,8 +349,9 @@ class TestingTools:
         Genereer een willekeurige Nederlandse voor- en achternaam.
 
 
-        De functie maakt gebruik van de `names`-bibliotheek om een willekeurige
-        voornaam en achternaam te genereren. De gegenereerde naam wordt geretourneerd
+        De functie maakt gebruik van de databestanden van de `names`-bibliotheek,
+        die per proces één keer worden ingelezen, om een willekeurige voornaam en
+        achternaam te genereren. De gegenereerde naam wordt geretourneerd
         als een tuple van strings.
 
 
@@ -174,9 +360,12 @@ class TestingTools:
         tuple
         Een tuple met twee elementen: (voornaam, achternaam).
         """
-        naam = nm.get_full_name()
-        logging.info("Naam %s is aangemaakt", naam)
-        return naam
+        geslacht = self._rng.choice(("first:male", "first:female"))
+        voornaam = _kies_naam(nm.FILES[geslacht], self._rng)
+        achternaam = _kies_naam(nm.FILES["last"], self._rng)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Naam %s %s is aangemaakt", voornaam, achternaam)
+        return voornaam, achternaam
 
     def genereer_geboortedatum(self):
         """
@@ -193,19 +382,19 @@ class TestingTools:
         str
         Een willekeurige geboortedatum als string in het formaat 'DD-MM-YYYY'.
         """
-        dag = random.randint(1, 28)
-        maand = random.randint(1, 12)
-        jaar = random.randint(1950, 2023)
-        return f"{dag:02d}-{maand:02d}-{jaar}"
+        dag = self._rng.randint(1, 28)
+        maand = self._rng.randint(1, 12)
+        jaar = self._rng.randint(1950, 2023)
+        return _DAGEN[dag] + "-" + _MAANDEN[maand] + "-" + str(jaar)
 
     def genereer_bsn(self):
         """
         Genereer een willekeurig geldig BSN-nummer.
 
 
-        Er wordt een willekeurig getal van 10 cijfers samengesteld. Het resultaat
-        wordt gecontroleerd met de methode `test_bsnnummer`. Alleen een geldig BSN
-        volgens de 11-proef wordt geretourneerd.
+        Er worden batches van 64 kandidaten als NumPy-array gegenereerd en in
+        één gevectoriseerde bewerking tegen de 11-proef gecontroleerd. De eerste
+        geldige kandidaat wordt geretourneerd.
 
 
         Returns
@@ -213,11 +402,116 @@ class TestingTools:
         str
         Een geldig BSN-nummer als string.
         """
-        bsn = ""
         while True:
-            bsn = "".join(str(random.randint(0, 9)) for _ in range(9))
-            if self.test_bsnnummer(int(bsn)):
-                return bsn
+            kandidaten = self._np_rng.integers(0, 10, size=(64, 9), dtype=np.int32)
+            totalen = kandidaten @ _BSN_GEWICHTEN
+            geldig = np.nonzero(totalen % 11 == 0)[0]
+            if geldig.size:
+                return f"{int(kandidaten[geldig[0]] @ _TIENMACHTEN):09d}"
+
+    def genereer_naam_batch(self, n: int):
+        """
+        Genereer `n` willekeurige (voornaam, achternaam)-tuples in één batch.
+
+        De gewogen trekking loopt per naamtabel als één `np.searchsorted` over
+        de cumulatieve gewichten, in plaats van `n` losse gewogen keuzes op
+        Python-niveau.
+
+        Parameters
+        ----------
+        n : int
+        Het aantal namen dat moet worden gegenereerd.
+
+        Returns
+        -------
+        list
+        Een lijst met `n` tuples (voornaam, achternaam).
+        """
+        rng = self._np_rng
+        achternaam_tabel, achternaam_cum = _laad_naamtabel(nm.FILES["last"])
+        indices = np.searchsorted(achternaam_cum, rng.random(n) * 90, side="right")
+        achternamen = achternaam_tabel[np.minimum(indices, len(achternaam_tabel) - 1)]
+
+        voornamen = np.empty(n, dtype=object)
+        mannelijk = rng.random(n) < 0.5
+        for sleutel, masker in (("first:male", mannelijk),
+                                ("first:female", ~mannelijk)):
+            tabel, cumulatief = _laad_naamtabel(nm.FILES[sleutel])
+            indices = np.searchsorted(
+                cumulatief, rng.random(int(masker.sum())) * 90, side="right")
+            voornamen[masker] = tabel[np.minimum(indices, len(tabel) - 1)]
+
+        return list(zip(voornamen, achternamen))
+
+    def _genereer_bsn_batch(self, n: int):
+        """
+        Genereer `n` geldige BSN-nummers in gevectoriseerde batches.
+
+        Parameters
+        ----------
+        n : int
+        Het aantal BSN-nummers dat moet worden gegenereerd.
+
+        Returns
+        -------
+        list
+        Een lijst met `n` geldige BSN-nummers als strings.
+        """
+        geldige = []
+        while len(geldige) < n:
+            omvang = max(64, (n - len(geldige)) * 12)
+            kandidaten = self._np_rng.integers(0, 10, size=(omvang, 9), dtype=np.int32)
+            totalen = kandidaten @ _BSN_GEWICHTEN
+            nummers = kandidaten[totalen % 11 == 0] @ _TIENMACHTEN
+            geldige.extend(f"{int(nummer):09d}" for nummer in nummers)
+        return geldige[:n]
+
+    def genereer_batch(self, n: int):
+        """
+        Genereer `n` volledige testpersonen in één batch.
+
+        De numerieke velden (postcode, telefoonnummer, geboortedatum, BSN)
+        worden met één NumPy-aanroep per veld voor alle rijen tegelijk
+        gegenereerd en de namen komen gevectoriseerd uit
+        `genereer_naam_batch`. Omdat de naamtabellen in het geheugen staan is de
+        generatie volledig CPU-gebonden en draait deze bewust op één thread;
+        een threadpool zou door de GIL alleen overhead toevoegen.
+
+        Parameters
+        ----------
+        n : int
+        Het aantal testpersonen dat moet worden gegenereerd.
+
+        Returns
+        -------
+        list
+        Een lijst met `n` rijen in de volgorde (voornaam, achternaam,
+        geboortedatum, BSN, email, telefoonnummer, postcode).
+        """
+        rng = self._np_rng
+        postcijfers = rng.integers(1000, 10000, size=n)
+        postletters = rng.choice(list(_ALFABET), size=(n, 2))
+        telefoonnummers = rng.integers(10000000, 100000000, size=n)
+        dagen = rng.integers(1, 29, size=n)
+        maanden = rng.integers(1, 13, size=n)
+        jaren = rng.integers(1950, 2024, size=n)
+        bsns = self._genereer_bsn_batch(n)
+        namen = self.genereer_naam_batch(n)
+
+        rijen = []
+        for i in range(n):
+            voornaam, achternaam = namen[i]
+            email = self.genereer_email(voornaam, achternaam)
+            rijen.append([
+                voornaam,
+                achternaam,
+                _DAGEN[dagen[i]] + "-" + _MAANDEN[maanden[i]] + "-" + str(jaren[i]),
+                bsns[i],
+                email,
+                f"06{telefoonnummers[i]}",
+                f"{postcijfers[i]} {postletters[i][0]}{postletters[i][1]}",
+            ])
+        return rijen
 
     def test_bsnnummer(self, bsn: int):
         """
@@ -225,8 +519,8 @@ class TestingTools:
 
 
         De functie gebruikt de Nederlandse 11-proef om te verifiëren of het
-        BSN-nummer correct is. Er wordt gelogd of het nummer geldig of ongeldig
-        is.
+        BSN-nummer correct is. Een geldig nummer wordt op DEBUG-niveau gelogd,
+        een ongeldig nummer op WARNING-niveau.
 
 
         Parameters
@@ -240,13 +534,15 @@ class TestingTools:
         bool
         `True` als het BSN geldig is volgens de 11-proef, `False` als het ongeldig is.
         """
-        bsnstring = str(bsn).zfill(9)
-
-        totaal = (int(bsnstring[0]) * 9)+(int(bsnstring[1]) * 8)+(int(bsnstring[2]) * 7)+(int(bsnstring[3]) * 6)+(int(
-            bsnstring[4]) * 5)+(int(bsnstring[5]) * 4)+(int(bsnstring[6]) * 3)+(int(bsnstring[7]) * 2)+(int(bsnstring[8]) * -1)
+        totaal = 0
+        resterend = bsn
+        for gewicht in (-1, 2, 3, 4, 5, 6, 7, 8, 9):
+            resterend, cijfer = divmod(resterend, 10)
+            totaal += cijfer * gewicht
 
         if totaal % 11 == 0:
-            logging.info("BSN nummer %i is geldig", bsn)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("BSN nummer %i is geldig", bsn)
             return True
         else:
             logging.warning("BSN nummer %i is ongeldig", bsn)
@@ -254,18 +550,16 @@ class TestingTools:
 
 tools = TestingTools()
 
-bestand = ["Voornaam,Achternaam,Geboortedatum,BSN,Email,telefoonnummer,postcode"]
-
-for i in range(5):
-    naam = tools.genereer_naam()
-    voornaam = naam.split()[0]
-    achternaam = naam.split()[-1]
-    geboortedaum = tools.genereer_geboortedatum()
-    bsn = tools.genereer_bsn()
-    telefoonnummer = tools.genereer_telefoonnummer()
-    email = tools.genereer_email(voornaam, achternaam)
-    postcode = tools.genereer_postcode()
-    bestand.append(f"{voornaam},{achternaam},{geboortedaum},{bsn},{email},{telefoonnummer},{postcode}")
-    
-with open(tools.output_dir / "gegenereerd.csv", "w", encoding="utf-8") as f:
-    f.write("\n".join(bestand))
\ No newline at end of file
+kolommen = ["Voornaam", "Achternaam", "Geboortedatum", "BSN", "Email",
+            "telefoonnummer", "postcode"]
+
+logging.disable(logging.INFO)
+rijen = tools.genereer_batch(5)
+logging.disable(logging.NOTSET)
+logging.info("%d testpersonen gegenereerd", len(rijen))
+
+with open(tools.output_dir / "gegenereerd.csv", "w", encoding="utf-8", newline="",
+          buffering=1 << 20) as f:
+    writer = csv.writer(f)
+    writer.writerow(kolommen)
+    writer.writerows(rijen)
\ No newline at end of file